@@ -1,17 +1,19 @@
 import os
+import sys
 import json
 import argparse
 import datetime
 import logging
 import time
+import functools
+import pickle
+import multiprocessing
 
-import harp
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import Normalize
-import matplotlib.image as image
-import cartopy.crs as ccrs
-import cmcrameri.cm as cmc
+
+
+CACHE_DIR = os.path.expanduser("~/.cache/plot-tropomi")
+GLOBAL_EXTENT = (-180, 180, -90, 90)
 
 
 def read_file(infile, conf, timeperiod):
@@ -23,9 +25,9 @@ def read_file(infile, conf, timeperiod):
     timeperiod -- length of merged data to plot, options: day|month
 
     Return:                        
-    latitudes -- observation latitude data
-    longitudes -- observation longitude data
-    obs_data -- data values
+    latitudes -- observation latitude data, cropped to plot extent
+    longitudes -- observation longitude data, cropped to plot extent
+    obs_data -- data values, cropped to plot extent
     description -- data description
     unit -- data unit
     datetime_start -- first timestamp of data
@@ -33,34 +35,81 @@ def read_file(infile, conf, timeperiod):
  
     """
     
-    # Open file with HARP
-    logger.debug(f'Reading data file {infile}')    
+    # Use cached data if it is at least as new as the data file
+    harp_var_name = conf["input"][timeperiod]["harp_var_name"]
+    cache_file = f'{infile}.{harp_var_name}.npz'
     try:
-        data = harp.import_product(infile)        
-    except Exception as e:
-        logger.error(f'Error while reading the data file {infile}')
-        logger.error(e)
-    
-    # Read observation data and its description and unit
-    obs_data = data[conf["input"][timeperiod]["harp_var_name"]].data
-    obs_data = obs_data.squeeze()
-    description = data[conf["input"][timeperiod]["harp_var_name"]].description
-    unit = data[conf["input"][timeperiod]["harp_var_name"]].unit
+        use_cache = os.path.getmtime(cache_file) >= os.path.getmtime(infile)
+    except OSError:
+        use_cache = False
+
+    if use_cache:
+        logger.debug(f'Reading cached data file {cache_file}')
+        try:
+            with np.load(cache_file) as cache:
+                obs_data = cache["val"]
+                latitudes = cache["lat"]
+                longitudes = cache["lon"]
+                description = str(cache["description"])
+                unit = str(cache["unit"])
+                dayssince_start = float(cache["dayssince_start"])
+                dayssince_stop = float(cache["dayssince_stop"])
+        except Exception as e:
+            logger.warning(f'Could not read data cache {cache_file}, reading data file instead')
+            logger.warning(e)
+            use_cache = False
+
+    if not use_cache:
+        import harp
+
+        # Open file with HARP
+        logger.debug(f'Reading data file {infile}')
+        try:
+            operations = f'keep({harp_var_name},latitude,longitude,datetime_start,datetime_stop)'
+            data = harp.import_product(infile, operations=operations)
+        except Exception as e:
+            logger.error(f'Error while reading the data file {infile}')
+            logger.error(e)
+            raise
+
+        # Read observation data and its description and unit
+        obs_data = data[harp_var_name].data
+        obs_data = np.ascontiguousarray(obs_data.squeeze(), dtype=np.float32)
+        description = data[harp_var_name].description
+        unit = data[harp_var_name].unit
+
+        # Read lat and lon data and datetimes as days since epochdate
+        latitudes = data.latitude.data
+        longitudes = data.longitude.data
+        dayssince_start = data.datetime_start.data[0]
+        dayssince_stop = data.datetime_stop.data[0]
+
+        # Save data to cache file for later runs
+        logger.debug(f'Writing cached data file {cache_file}')
+        try:
+            write_cache_file(cache_file, lambda f: np.savez(
+                f, val=obs_data, lat=latitudes, lon=longitudes,
+                description=description, unit=unit,
+                dayssince_start=dayssince_start, dayssince_stop=dayssince_stop))
+        except OSError as e:
+            logger.warning(f'Could not write data cache {cache_file}')
+            logger.warning(e)
     
-    # Get min value if min_value in conf and mark values under it np.nan
+    # Crop data to the plotted area so that only it is masked and plotted
     plot_conf = conf["plot"][timeperiod]
+    extent = tuple(plot_conf.get("extent", GLOBAL_EXTENT))
+    latitudes, longitudes, obs_data = crop_to_extent(latitudes, longitudes, obs_data, extent)
+    obs_data = np.ascontiguousarray(obs_data, dtype=np.float32)
+
+    # Get min value if min_value in conf and mark values under it np.nan
     min_value = plot_conf.get("min_value")
-    if min_value:
-        obs_data[obs_data < min_value] = np.nan
-    
-    # Read lat and lon data
-    latitudes = data.latitude.data
-    longitudes = data.longitude.data
+    if min_value is not None:
+        np.putmask(obs_data, obs_data < min_value, np.nan)
 
-    # Read datetimes and convert "since epochdate" to timestamp
+    # Convert datetimes "since epochdate" to timestamp
     epochdate = conf["input"][timeperiod]["epochdate"]
-    datetime_start = dayssince_to_timestamp(epochdate, data.datetime_start.data[0])
-    datetime_stop = dayssince_to_timestamp(epochdate, data.datetime_stop.data[0])
+    datetime_start = dayssince_to_timestamp(epochdate, dayssince_start)
+    datetime_stop = dayssince_to_timestamp(epochdate, dayssince_stop)
 
     return latitudes, longitudes, obs_data, description, unit, datetime_start, datetime_stop
 
@@ -77,12 +126,279 @@ def dayssince_to_timestamp(epochdate, dayssince):
  
     """    
 
-    epochdate = datetime.datetime.strptime(epochdate,"%Y%m%d")
-    timestamp = (epochdate + datetime.timedelta(days=dayssince)).strftime('%Y-%m-%d %H:%M')
+    timestamp = str(np.datetime_as_string(dayssince_to_datetime64(epochdate, dayssince), unit='m')).replace('T', ' ')
 
     return timestamp
+
+
+def dayssince_to_datetime64(epochdate, dayssince):
+    """ Convert days since epochdate to datetime64 with minute precision
+
+    Keyword arguments:
+    epochdate -- date from which days since is calculated in format %Y%m%d
+    dayssince -- number of days (can be decimal, scalar or array) since epochdate
+
+    Return:
+    datetimes -- datetime64[m] corresponding to dayssince
+
+    """
+
+    return parse_epochdate(epochdate) + dayssince_to_minutes(dayssince).astype('timedelta64[m]')
+
+
+@functools.lru_cache(maxsize=8)
+def parse_epochdate(epochdate):
+    """ Parse epochdate string, cached as it is constant per configuration
+
+    Keyword arguments:
+    epochdate -- date from which days since is calculated in format %Y%m%d
+
+    Return:
+    epoch -- epochdate as datetime64[m]
+
+    """
+
+    return np.datetime64(datetime.datetime.strptime(epochdate, "%Y%m%d"), 'm')
+
+
+def dayssince_to_minutes(dayssince):
+    """ Convert days since epochdate to whole minutes since epochdate
+
+    Keyword arguments:
+    dayssince -- number of days (can be decimal, scalar or array) since epochdate
+
+    Return:
+    minutes -- whole minutes since epochdate as int64
+
+    """
+
+    # Round to microseconds first like datetime.timedelta does, then truncate to minutes
+    microseconds = np.round(np.asarray(dayssince, dtype=np.float64) * 86400e6).astype(np.int64)
+
+    return microseconds // 60_000_000
     
 
+def write_cache_file(cache_file, write):
+    """ Write cache file through a temporary file replacing it when complete,
+    so that other processes never read a partially written cache
+
+    Keyword arguments:
+    cache_file -- path of cache file
+    write -- function writing the cache content to an open binary file
+
+    """
+
+    # Process specific name keeps parallel writers apart, and a plain open
+    # gives the file the usual umask permissions so other users can read it
+    tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_file, "wb") as f:
+            write(f)
+        os.replace(tmp_file, cache_file)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+@functools.lru_cache(maxsize=None)
+def get_feature(name, extent, resolution='110m', category='physical'):
+    """ Get Natural Earth geometries clipped to extent, cached on disk
+
+    Keyword arguments:
+    name -- Natural Earth dataset name, e.g. coastline
+    extent -- tuple (lon_min, lon_max, lat_min, lat_max)
+    resolution -- Natural Earth resolution, options: 10m|50m|110m
+    category -- Natural Earth category, options: physical|cultural
+
+    Return:
+    geoms -- list of shapely geometries clipped to extent
+
+    """
+
+    import cartopy.io.shapereader as shpreader
+    from shapely.geometry import box
+    from shapely.prepared import prep
+
+    cache_file = f'{CACHE_DIR}/{name}_{resolution}_clip_{"_".join(str(e) for e in extent)}.pkl'
+    if os.path.exists(cache_file):
+        logger.debug(f'Reading cached geometries from {cache_file}')
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f'Could not read geometry cache {cache_file}, rebuilding it')
+            logger.warning(e)
+
+    logger.debug(f'Reading Natural Earth {resolution} {name} geometries')
+    reader = shpreader.Reader(shpreader.natural_earth(resolution=resolution, category=category, name=name))
+    # Clip geometries to extent so that nothing outside it is transformed
+    bbox = box(extent[0], extent[2], extent[1], extent[3])
+    prepared_bbox = prep(bbox)
+    geoms = [geom if prepared_bbox.contains(geom) else bbox.intersection(geom)
+             for geom in reader.geometries() if prepared_bbox.intersects(geom)]
+    geoms = [geom for geom in geoms if not geom.is_empty]
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_cache_file(cache_file, lambda f: pickle.dump(geoms, f))
+    except OSError as e:
+        logger.warning(f'Could not write geometry cache {cache_file}')
+        logger.warning(e)
+
+    return geoms
+
+
+@functools.lru_cache(maxsize=None)
+def get_coastline_segments(extent):
+    """ Get coastline vertices intersecting extent as line segments
+
+    Keyword arguments:
+    extent -- tuple (lon_min, lon_max, lat_min, lat_max)
+
+    Return:
+    segments -- list of (N, 2) arrays of lon, lat vertices
+
+    """
+
+    # Clipping can leave single points where coastlines touch the extent edge
+    segments = [np.asarray(line.coords)
+                for geom in get_feature('coastline', extent)
+                for line in getattr(geom, 'geoms', [geom])
+                if line.geom_type == 'LineString']
+
+    return segments
+
+
+def crop_to_extent(latitudes, longitudes, obs_data, extent):
+    """ Crop data to the grid cells covering extent
+
+    Keyword arguments:
+    latitudes -- observation latitude data
+    longitudes -- observation longitude data
+    obs_data -- data values
+    extent -- tuple (lon_min, lon_max, lat_min, lat_max)
+
+    Return:
+    latitudes -- cropped latitude data in ascending order
+    longitudes -- cropped longitude data
+    obs_data -- cropped data values
+
+    """
+
+    # Flip descending latitudes so that they can be searched
+    if latitudes[0] > latitudes[-1]:
+        latitudes = latitudes[::-1]
+        obs_data = obs_data[::-1, :]
+
+    # Keep one extra cell on each side so that the edges are covered
+    x0 = max(0, np.searchsorted(longitudes, extent[0], side='left') - 1)
+    x1 = np.searchsorted(longitudes, extent[1], side='right') + 1
+    y0 = max(0, np.searchsorted(latitudes, extent[2], side='left') - 1)
+    y1 = np.searchsorted(latitudes, extent[3], side='right') + 1
+
+    return latitudes[y0:y1], longitudes[x0:x1], obs_data[y0:y1, x0:x1]
+
+
+def regular_grid_extent(latitudes, longitudes):
+    """ Get cell edge extent of a regular lat/lon grid
+
+    Keyword arguments:
+    latitudes -- grid cell centre latitudes
+    longitudes -- grid cell centre longitudes
+
+    Return:
+    extent -- list [lon_min, lon_max, lat_min, lat_max] of cell edges,
+              None if the grid is not regular
+
+    """
+
+    extent = []
+    for coords in (longitudes, latitudes):
+        if len(coords) < 2:
+            return None
+        # Allow for rounding of coordinates stored in single precision
+        step = coords[1] - coords[0]
+        if not np.allclose(np.diff(coords), step, rtol=0, atol=1e-3*abs(step)):
+            return None
+        extent += [coords[0] - step/2, coords[-1] + step/2]
+
+    return extent
+
+
+def cell_edges(coords):
+    """ Get grid cell edges from ascending cell centre coordinates
+
+    Keyword arguments:
+    coords -- grid cell centre coordinates
+
+    Return:
+    edges -- grid cell edge coordinates, one more than coords
+
+    """
+
+    mid = (coords[1:] + coords[:-1]) / 2
+
+    return np.concatenate(([2*coords[0] - mid[0]], mid, [2*coords[-1] - mid[-1]]))
+
+
+@functools.lru_cache(maxsize=None)
+def get_plate_carree():
+    """ Get PlateCarree projection, shared by all plots of the process
+
+    Return:
+    plate_carree -- cartopy PlateCarree CRS
+
+    """
+
+    import cartopy.crs as ccrs
+
+    return ccrs.PlateCarree()
+
+
+def get_pyplot():
+    """ Import pyplot with the non-interactive Agg backend
+
+    Return:
+    plt -- matplotlib.pyplot module
+
+    """
+
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+@functools.lru_cache(maxsize=None)
+def get_norm_cmap(colormap, vmin, vmax):
+    """ Get normalization and colormap, cached for repeated plots
+
+    Keyword arguments:
+    colormap -- colormap name
+    vmin -- colormap min value
+    vmax -- colormap max value
+
+    Return:
+    norm -- normalization from data values to colormap range
+    cmap -- colormap with its lookup table initialized
+
+    """
+
+    import matplotlib
+    from matplotlib.colors import Normalize
+    # cmcrameri imports pyplot, so the backend is selected before it
+    get_pyplot()
+    import cmcrameri.cm  # noqa: F401 registers the cmc.* colormaps
+
+    norm = Normalize(vmin, vmax)
+    cmap = matplotlib.colormaps[colormap]
+    # Evaluating the colormap once builds its lookup table outside the draw
+    cmap(0.0)
+
+    return norm, cmap
+
+
 def plot_data(figname, latitudes, longitudes, obs_data, description, unit, conf, timeperiod, datetime_start, datetime_stop, logos, fmi_logo):
     """ Plot satellite data and logos
 
@@ -101,24 +417,71 @@ def plot_data(figname, latitudes, longitudes, obs_data, description, unit, conf,
  
     """
 
+    from matplotlib.collections import LineCollection
+
+    plt = get_pyplot()
+
     # Read config plot parameter
     vmin = conf["plot"][timeperiod]["vmin"]
     vmax = conf["plot"][timeperiod]["vmax"]
     colormap = conf["plot"][timeperiod]["colormap"]
+    norm, cmap = get_norm_cmap(colormap, vmin, vmax)
+    extent = tuple(conf["plot"][timeperiod].get("extent", GLOBAL_EXTENT))
+    renderer = conf["plot"][timeperiod].get("renderer", "imshow")
+    if renderer not in ("imshow", "pcolormesh"):
+        raise ValueError(f'Unknown renderer "{renderer}" in plot config, options: imshow|pcolormesh')
+    decimate = conf["plot"][timeperiod].get("decimate", True)
     
-    print("np.nanmin(obs_data)", np.nanmin(obs_data))
-    print("np.nanmax(obs_data)", np.nanmax(obs_data))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f'Data min {np.nanmin(obs_data)}, max {np.nanmax(obs_data)}')
     
     # Create plot
     logger.debug('Plotting image')
-    fig, axs = plt.subplots(figsize=(20,10))
-
-    # Plot map
-    ax = plt.axes(projection = ccrs.PlateCarree())
-    ax.set_extent([-180, 180, -90, 90], ccrs.PlateCarree())
-    img = plt.pcolormesh(longitudes, latitudes, obs_data, vmin = vmin, vmax = vmax, cmap = colormap, transform = ccrs.PlateCarree())
-    ax.coastlines()
-    ax.gridlines()
+    fig = plt.figure(figsize=(20,10), dpi=conf["output"][timeperiod].get("dpi"))
+
+    # Plot map. PlateCarree is an identity transform for the global extent, so
+    # plain axes are used there and cartopy only for regional extents.
+    global_extent = extent == GLOBAL_EXTENT
+    if global_extent:
+        ax = fig.add_subplot()
+        ax.set_xlim(extent[0], extent[1])
+        ax.set_ylim(extent[2], extent[3])
+        ax.set_aspect('equal')
+        transform = ax.transData
+    else:
+        plate_carree = get_plate_carree()
+        ax = fig.add_subplot(projection = plate_carree)
+        ax.set_extent(extent, plate_carree)
+        transform = plate_carree
+
+    # Decimate data to roughly match the output pixel resolution
+    if decimate:
+        stride_y = max(1, obs_data.shape[-2] // int(fig.get_figheight() * fig.dpi))
+        stride_x = max(1, obs_data.shape[-1] // int(fig.get_figwidth() * fig.dpi))
+        logger.debug(f'Decimating data with strides {stride_y} (lat) and {stride_x} (lon)')
+        obs_data = obs_data[::stride_y, ::stride_x]
+        latitudes = latitudes[::stride_y]
+        longitudes = longitudes[::stride_x]
+
+    # Regular grids are drawn as a single image and irregular grids on plain
+    # axes as a non-uniform image, unless a mesh is configured
+    img_extent = regular_grid_extent(latitudes, longitudes) if renderer == "imshow" else None
+    if img_extent is not None:
+        img = ax.imshow(obs_data, origin = 'lower', extent = img_extent, norm = norm, cmap = cmap, transform = transform, interpolation = 'nearest')
+    elif renderer == "imshow" and global_extent:
+        img = ax.pcolorfast(cell_edges(longitudes), cell_edges(latitudes), obs_data, norm = norm, cmap = cmap)
+    else:
+        img = ax.pcolormesh(longitudes, latitudes, obs_data, norm = norm, cmap = cmap, transform = transform)
+        img.set_rasterized(True)
+        img.set_antialiased(False)
+    ax.add_collection(LineCollection(get_coastline_segments(extent), colors='black', linewidths=1, transform=transform), autolim=False)
+    if global_extent:
+        ax.set_xticks(range(-180, 181, 60))
+        ax.set_yticks(range(-90, 91, 30))
+        ax.tick_params(length=0, labelbottom=False, labelleft=False)
+        ax.grid()
+    else:
+        ax.gridlines()
     ax.set_title(f"L3 merged product of {description} \n First timestamp: {datetime_start}   Last timestamp: {datetime_stop}", fontsize=16)
 
     # Add colorbar
@@ -126,20 +489,145 @@ def plot_data(figname, latitudes, longitudes, obs_data, description, unit, conf,
     cbar.set_label(f'{description} [{unit}]',fontsize=15)
     cbar.ax.tick_params(labelsize=14)
 
-    # Add logos
-    newax = fig.add_axes([0.13, 0.07, 0.5, 0.05], anchor='SW')
+    # Add logos below and above the map, whose final size depends on the extent
+    ax.apply_aspect()
+    map_pos = ax.get_position()
+    newax = fig.add_axes([map_pos.x0 + 0.005, map_pos.y0 - 0.063, 0.5, 0.05], anchor='SW')
     newax.imshow(logos)
-    newax2 = fig.add_axes([0.13, 0.87, 0.5, 0.05], anchor='SW')
+    newax2 = fig.add_axes([map_pos.x0 + 0.005, map_pos.y1 + 0.013, 0.5, 0.05], anchor='SW')
     newax2.imshow(fmi_logo)
 
     # Remove extra axis
     newax.axis('off')
     newax2.axis('off')
-    axs.axis('off')
 
     # Save figure to file
     logger.debug(f'Save image to file {figname}')
-    fig.savefig(figname, bbox_inches = 'tight') #, dpi = 300)
+    savefig_kwargs = {}
+    if figname.lower().endswith('.png'):
+        # Fast zlib level for large rasters, skip the Software metadata entry
+        savefig_kwargs = {'pil_kwargs': {'compress_level': 1}, 'metadata': {'Software': None}}
+    # Compute tight bounding box with the canvas renderer, which savefig then reuses
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(plt.rcParams['savefig.pad_inches'])
+    fig.savefig(figname, bbox_inches = bbox, **savefig_kwargs)
+    plt.close(fig)
+
+
+def read_config(config_file):
+    """ Read configuration file, cached until the file is modified
+
+    Keyword arguments:
+    config_file -- configuration .json file
+
+    Return:
+    conf -- config dictionary
+
+    """
+
+    return load_json(config_file, os.path.getmtime(config_file))
+
+
+@functools.lru_cache(maxsize=None)
+def load_json(filename, mtime):
+    """ Load json file, cached by filename and modification time
+
+    Keyword arguments:
+    filename -- .json file
+    mtime -- modification time of the file, used as part of the cache key
+
+    Return:
+    content -- parsed file content
+
+    """
+
+    with open(filename, "r") as jsonfile:
+        return json.load(jsonfile)
+
+
+@functools.lru_cache(maxsize=None)
+def read_logos():
+    """ Read logo images, cached for repeated calls
+
+    Return:
+    logos -- logos image to be added in the picture
+    fmi_logo -- FMI logo image to be added in the picture
+
+    """
+
+    from PIL import Image
+
+    logger.debug('Reading logo images')
+    logos = np.asarray(Image.open("logos.png").convert('RGBA'), dtype=np.uint8)
+    fmi_logo = np.asarray(Image.open("fmi_logo.png").convert('RGBA'), dtype=np.uint8)
+
+    return logos, fmi_logo
+
+
+def plot_date(job):
+    """ Read and plot data of one date
+
+    Keyword arguments:
+    job -- tuple (date, conf, timeperiod) of date to plot in format %Y%m%d,
+           config dictionary and length of merged data to plot
+
+    Return:
+    success -- True if the date was plotted, False if plotting failed
+
+    """
+
+    date, conf, timeperiod = job
+
+    # Errors are logged here so that one failing date does not stop the others
+    try:
+        # Read data and logos
+        infile = f'{conf["input"][timeperiod]["path"]}/{conf["input"][timeperiod]["filename"].format(date = date)}'
+        latitudes, longitudes, obs_data, description, unit, datetime_start, datetime_stop = read_file(infile, conf, timeperiod)
+        logos, fmi_logo = read_logos()
+
+        # Plot data
+        figname = f'{conf["output"][timeperiod]["path"]}/{conf["output"][timeperiod]["filename"].format(date = date)}'
+        plot_data(figname, latitudes, longitudes, obs_data, description, unit, conf, timeperiod, datetime_start, datetime_stop, logos, fmi_logo)
+    except Exception as e:
+        logger.error(f'Error while plotting date {date}')
+        logger.exception(e)
+        return False
+
+    return True
+
+
+def parse_dates(dates):
+    """ Parse comma separated list of dates and date ranges
+
+    Keyword arguments:
+    dates -- dates in format %Y%m%d separated by commas, ranges as
+             start-end including both ends, e.g. 20230201-20230205,20230210
+
+    Return:
+    date_list -- list of dates in format %Y%m%d, not empty
+
+    Raises argparse.ArgumentTypeError for malformed dates and reversed ranges,
+    so that the function can be used as argparse type.
+
+    """
+
+    date_list = []
+    for item in dates.split(','):
+        start, _, stop = item.strip().partition('-')
+        try:
+            date = datetime.datetime.strptime(start, "%Y%m%d")
+            stop = datetime.datetime.strptime(stop, "%Y%m%d") if stop else date
+            # strptime also accepts unpadded dates such as 2023021
+            if f'{date:%Y%m%d}-{stop:%Y%m%d}' not in (item.strip(), f'{item.strip()}-{item.strip()}'):
+                raise ValueError
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'invalid date or date range "{item}", expected YYYYMMDD or YYYYMMDD-YYYYMMDD')
+        if stop < date:
+            raise argparse.ArgumentTypeError(f'date range "{item}" ends before it starts')
+        while date <= stop:
+            date_list.append(date.strftime("%Y%m%d"))
+            date += datetime.timedelta(days=1)
+
+    return date_list
 
 
 def main():
@@ -148,22 +636,30 @@ def main():
     config_file = f"conf/{options.var}.json"
     logger.debug(f'Reading config file {config_file}')
     try:
-        with open(config_file, "r") as jsonfile:
-            conf = json.load(jsonfile)
+        conf = read_config(config_file)
     except Exception as e:
         logger.error(f'Error while reading the configuration file {config_file}')
         logger.error(e)
         
-    # Read data and logos
+    # Plot each date, in parallel worker processes if there are several
     timeperiod = options.timeperiod
-    infile = f'{conf["input"][timeperiod]["path"]}/{conf["input"][timeperiod]["filename"].format(date = options.date)}'
-    latitudes, longitudes, obs_data, description, unit, datetime_start, datetime_stop = read_file(infile, conf, timeperiod)
-    fmi_logo = image.imread("fmi_logo.png")
-    logos = image.imread("logos.png")
-
-    # Plot data
-    figname = f'{conf["output"][timeperiod]["path"]}/{conf["output"][timeperiod]["filename"].format(date = options.date)}'
-    plot_data(figname, latitudes, longitudes, obs_data, description, unit, conf, timeperiod, datetime_start, datetime_stop, logos, fmi_logo)
+    dates = options.dates if options.dates else [options.date]
+    jobs = [(date, conf, timeperiod) for date in dates]
+    if len(jobs) <= 1:
+        results = [plot_date(job) for job in jobs]
+    else:
+        # Read logos before forking so that workers inherit the cached images
+        read_logos()
+        processes = min(len(jobs), os.cpu_count() or 1)
+        logger.debug(f'Plotting {len(jobs)} dates with {processes} processes')
+        with multiprocessing.get_context('fork').Pool(processes) as pool:
+            results = pool.map(plot_date, jobs, chunksize=1)
+
+    # Exit with error status after all dates have been tried
+    failed_dates = [date for date, success in zip(dates, results) if not success]
+    if failed_dates:
+        logger.error(f'Plotting failed for dates {", ".join(failed_dates)}')
+        sys.exit(1)
     
 
 if __name__ == '__main__':
@@ -177,6 +673,10 @@ if __name__ == '__main__':
                         type = str,
                         default = '20230209',
                         help = 'Date to plot.')
+    parser.add_argument('--dates',
+                        type = parse_dates,
+                        default = None,
+                        help = 'Dates to plot in parallel, overrides --date. Comma separated dates and ranges, e.g. 20230201-20230205,20230210')
     parser.add_argument('--timeperiod',
                         type = str,
                         default = 'day',